@@ -5,9 +5,119 @@ This module implements a system for street food vendors to track inventory,
 sales, customer feedback, and daily operations using various file operations.
 """
 
+import io
 import os
+import re
 import csv
+import copy
+import time
+import shutil
 import datetime
+import tempfile
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Most files each cache holds; the least recently used one is evicted first
+_CACHE_SIZE = 8
+
+# Parsed inventory keyed by file path, stored with the file stamp it was
+# parsed from so an edited file is always re-read
+_inventory_cache = collections.OrderedDict()
+
+# Sales summaries and the most recently requested day's sales rows, both
+# keyed by file path and stored with the file stamp they were read from
+_sales_report_cache = collections.OrderedDict()
+_daily_sales_cache = collections.OrderedDict()
+
+
+# One feedback entry: its header line and the lines up to the next blank
+# line or header, which hold its fields in any order
+_FEEDBACK_RE = re.compile(
+    r"^[ \t]*===== FEEDBACK: (?P<timestamp>.*?)[ =]*$"
+    r"(?P<body>(?:\n(?![ \t]*$)(?![ \t]*===== FEEDBACK:).*)*)",
+    re.MULTILINE
+)
+
+# One field line inside a feedback entry
+_FEEDBACK_FIELD_RE = re.compile(r"^[ \t]*(Customer|Rating|Comments): (.*?)[ \t]*$", re.MULTILINE)
+
+
+# (epoch second, formatted timestamp) for the most recent log entry
+_timestamp_cache = (None, "")
+
+
+# Process umask, read once at import; os.umask can only be read by setting
+# it, which would affect files other threads create in the meantime
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _now_str():
+    """
+    Return the current local time as YYYY-MM-DD HH:MM:SS, formatting it
+    at most once per second.
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, timestamp = _timestamp_cache
+    if second != cached_second:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _timestamp_cache = (second, timestamp)
+    return timestamp
+
+
+def _file_stamp(file_path):
+    """
+    Return an (inode, mtime, size) triple identifying the current version
+    of a file; the inode changes whenever the file is replaced. Accepts a
+    path or an open file descriptor.
+    """
+    stat = os.stat(file_path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _cache_put(cache, key, value):
+    """
+    Store a value in one of the file caches as its most recently used
+    entry, evicting the oldest entry once the cache is full.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _parse_inventory_lines(lines):
+    """
+    Parse the lines of an inventory file into a dictionary of items.
+    """
+    inventory = {}
+    try:
+        for line in lines:
+            # Strip each line once and reuse it for the check and the split
+            stripped = line.strip()
+            if stripped and not line.startswith('#'):
+                parts = stripped.split(',')
+                if len(parts) != 3:
+                    raise ValueError(f"Invalid line format: {line}")
+
+                item_name, quantity, price = parts
+                inventory[item_name] = {
+                    'quantity': int(quantity),
+                    'price': float(price)
+                }
+        return inventory
+    except ValueError as e:
+        raise ValueError(f"Error parsing inventory data: {e}")
+
+
+def _parse_inventory(file_path):
+    """
+    Parse an inventory file into a dictionary of items.
+    """
+    with open(file_path, 'r') as file:
+        return _parse_inventory_lines(file)
 
 
 def read_inventory(file_path):
@@ -24,26 +134,64 @@ def read_inventory(file_path):
         FileNotFoundError: If the file does not exist
         ValueError: If the file format is invalid
     """
-    if not os.path.exists(file_path):
+    try:
+        stamp = _file_stamp(file_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Inventory file not found: {file_path}")
     
-    inventory = {}
+    cached = _inventory_cache.get(file_path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _parse_inventory(file_path))
+    _cache_put(_inventory_cache, file_path, cached)
+    
+    # Hand out a copy so callers cannot modify the cached inventory
+    return {item: dict(details) for item, details in cached[1].items()}
+
+
+def _write_inventory(file_path, inventory):
+    """
+    Write a complete inventory dictionary back to the inventory file and
+    return the inventory as it will be read back from it.
+    """
+    # Build every line first so the file is written in a single call
+    lines = ["# Inventory - format: item_name,quantity,price\n"]
+    lines.extend(f"{item},{details['quantity']},{details['price']}\n" for item, details in inventory.items())
+    
+    # Parse the lines before writing them, splitting them the way reading
+    # the file would: a name that would break the file is rejected here, and
+    # the cache gets exactly what a fresh read returns
+    written = _parse_inventory_lines(io.StringIO(''.join(lines), newline=None))
+    
+    # Write to a temporary file next to the real one and swap it in, so
+    # readers never see a partially written inventory; symlinks are
+    # resolved so the file they point at is the one replaced
+    target_path = os.path.realpath(file_path)
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(target_path))
     try:
-        with open(file_path, 'r') as file:
-            for line in file:
-                if line.strip() and not line.startswith('#'):
-                    parts = line.strip().split(',')
-                    if len(parts) != 3:
-                        raise ValueError(f"Invalid line format: {line}")
-                    
-                    item_name, quantity, price = parts
-                    inventory[item_name] = {
-                        'quantity': int(quantity),
-                        'price': float(price)
-                    }
-        return inventory
-    except ValueError as e:
-        raise ValueError(f"Error parsing inventory data: {e}")
+        with os.fdopen(fd, 'w') as file:
+            file.writelines(lines)
+            file.flush()
+            # Renaming keeps the inode, mtime and size, so this is also the
+            # stamp of the file once it is in place
+            stamp = _file_stamp(file.fileno())
+        
+        try:
+            shutil.copymode(target_path, temp_path)
+        except FileNotFoundError:
+            # New inventory: use the permissions open() would have given it
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+        
+        os.replace(temp_path, target_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # Seed the cache so the next read does not re-parse what we just wrote
+    _cache_put(_inventory_cache, file_path, (stamp, written))
+    return written
 
 
 def update_inventory(file_path, item_name, quantity, price):
@@ -56,6 +204,9 @@ def update_inventory(file_path, item_name, quantity, price):
         quantity: Quantity available
         price: Price per unit
         
+    Returns:
+        Dictionary with the updated inventory, as read back from the file
+        
     Raises:
         ValueError: If any required fields are invalid
     """
@@ -69,18 +220,19 @@ def update_inventory(file_path, item_name, quantity, price):
         raise ValueError("Quantity must be an integer and price must be a number")
 
     # Read existing inventory
-    inventory = {}
-    if os.path.exists(file_path):
+    try:
         inventory = read_inventory(file_path)
+    except FileNotFoundError:
+        inventory = {}
     
     # Update inventory
     inventory[item_name] = {'quantity': quantity, 'price': price}
     
     # Write updated inventory back to file
-    with open(file_path, 'w') as file:
-        file.write("# Inventory - format: item_name,quantity,price\n")
-        for item, details in inventory.items():
-            file.write(f"{item},{details['quantity']},{details['price']}\n")
+    written = _write_inventory(file_path, inventory)
+    
+    # The written inventory is now cached, so hand back a copy
+    return {item: dict(details) for item, details in written.items()}
 
 
 def log_sale(file_path, item_name, quantity, total_price):
@@ -99,20 +251,56 @@ def log_sale(file_path, item_name, quantity, total_price):
     if not item_name or quantity <= 0 or total_price <= 0:
         raise ValueError("Invalid sale data")
     
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Check if file exists to determine if we need to write headers
-    file_exists = os.path.exists(file_path)
+    record = f"{_now_str()},{item_name},{quantity},{total_price}\n"
     
     try:
-        with open(file_path, 'a') as file:
-            if not file_exists:
-                file.write("timestamp,item_name,quantity,total_price\n")
-            file.write(f"{timestamp},{item_name},{quantity},{total_price}\n")
+        # Create the file with headers, or append if it already exists
+        try:
+            file = open(file_path, 'x')
+            record = "timestamp,item_name,quantity,total_price\n" + record
+        except FileExistsError:
+            file = open(file_path, 'a')
+        
+        with file:
+            file.write(record)
     except IOError as e:
         raise IOError(f"Error writing to sales log: {e}")
 
 
+def apply_sale(inventory_file, sales_file, item_name, quantity):
+    """
+    Record a sale and deduct the sold quantity from the inventory.
+    
+    Args:
+        inventory_file: Path to the inventory file
+        sales_file: Path to the sales log file
+        item_name: Name of the item sold
+        quantity: Quantity sold
+        
+    Returns:
+        Total price of the sale
+        
+    Raises:
+        ValueError: If the item is unknown, out of stock, or the sale is invalid
+    """
+    # Read the inventory once and use it for both the check and the update
+    inventory = read_inventory(inventory_file)
+    if item_name not in inventory:
+        raise ValueError(f"{item_name} not found in inventory")
+    
+    details = inventory[item_name]
+    if details['quantity'] < quantity:
+        raise ValueError(f"Not enough {item_name} in inventory")
+    
+    total_price = details['price'] * quantity
+    log_sale(sales_file, item_name, quantity, total_price)
+    
+    details['quantity'] -= quantity
+    _write_inventory(inventory_file, inventory)
+    
+    return total_price
+
+
 def save_customer_feedback(file_path, customer_name, rating, comments):
     """
     Save customer feedback to a text file.
@@ -133,7 +321,7 @@ def save_customer_feedback(file_path, customer_name, rating, comments):
     except ValueError:
         raise ValueError("Rating must be an integer between 1 and 5")
     
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = _now_str()
     
     try:
         with open(file_path, 'a') as file:
@@ -145,54 +333,109 @@ def save_customer_feedback(file_path, customer_name, rating, comments):
         raise IOError(f"Error saving feedback: {e}")
 
 
-def read_sales_report(file_path):
+def _summarize_sales(file_path):
     """
-    Read sales data from a CSV file and generate a summary.
-    
-    Args:
-        file_path: Path to the sales CSV file
-        
-    Returns:
-        Dictionary with sales summary (total revenue, items sold, etc.)
-        
-    Raises:
-        FileNotFoundError: If the file does not exist
+    Parse a sales CSV file into a summary dictionary.
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Sales file not found: {file_path}")
-    
     try:
         total_revenue = 0
-        item_counts = {}
+        item_counts = collections.Counter()
         
         with open(file_path, 'r', newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is not None:
+                # Look columns up once instead of building a dict per row
+                item_col = header.index('item_name')
+                quantity_col = header.index('quantity')
+                price_col = header.index('total_price')
+            
             for row in reader:
-                item_name = row['item_name']
-                quantity = int(row['quantity'])
-                total_price = float(row['total_price'])
+                if not row:
+                    continue
                 
-                total_revenue += total_price
+                item_name = row[item_col]
+                quantity = int(row[quantity_col])
+                total_price = float(row[price_col])
                 
-                if item_name in item_counts:
-                    item_counts[item_name] += quantity
-                else:
-                    item_counts[item_name] = quantity
+                total_revenue += total_price
+                item_counts[item_name] += quantity
         
         # Find best-selling item
-        best_seller = max(item_counts.items(), key=lambda x: x[1]) if item_counts else None
+        best_seller = item_counts.most_common(1)[0] if item_counts else None
         
         return {
             'total_revenue': total_revenue,
             'items_sold': sum(item_counts.values()),
             'unique_items': len(item_counts),
             'best_seller': best_seller,
-            'item_breakdown': item_counts
+            'item_breakdown': dict(item_counts)
         }
     except (csv.Error, ValueError) as e:
         raise ValueError(f"Error processing sales data: {e}")
 
 
+def read_sales_report(file_path):
+    """
+    Read sales data from a CSV file and generate a summary.
+    
+    Args:
+        file_path: Path to the sales CSV file
+        
+    Returns:
+        Dictionary with sales summary (total revenue, items sold, etc.)
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    try:
+        stamp = _file_stamp(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Sales file not found: {file_path}")
+    
+    cached = _sales_report_cache.get(file_path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _summarize_sales(file_path))
+    _cache_put(_sales_report_cache, file_path, cached)
+    
+    # Hand out a copy so callers cannot modify the cached report
+    return copy.deepcopy(cached[1])
+
+
+def _read_daily_sales(sales_file, date):
+    """
+    Return the (timestamp, item_name, quantity, total_price) rows logged on
+    a date, re-reading the sales file only when it has changed.
+    """
+    stamp = _file_stamp(sales_file)
+    cached = _daily_sales_cache.get(sales_file)
+    if cached is not None and cached[:2] == (stamp, date):
+        _cache_put(_daily_sales_cache, sales_file, cached)
+        return cached[2]
+    
+    daily_sales = []
+    with open(sales_file, 'r', newline='') as csvfile:
+        header = next(csv.reader(csvfile), None)
+        if header is not None:
+            columns = [header.index(name) for name in ('timestamp', 'item_name', 'quantity', 'total_price')]
+        
+        # log_sale writes the timestamp first, so lines from other days
+        # can be dropped before they are tokenized; the timestamp may also
+        # be quoted if the file was written by another tool
+        lines = csvfile
+        if header is not None and columns[0] == 0:
+            prefixes = (date, '"' + date)
+            lines = (line for line in csvfile if line.startswith(prefixes))
+        
+        for row in csv.reader(lines):
+            if row and row[columns[0]].startswith(date):
+                daily_sales.append([row[i] for i in columns])
+    
+    # Keep one date per file so the cache cannot grow with every date asked for
+    _cache_put(_daily_sales_cache, sales_file, (stamp, date, daily_sales))
+    return daily_sales
+
+
 def generate_daily_report(inventory_file, sales_file, report_file, date):
     """
     Generate a daily report with inventory and sales information.
@@ -211,16 +454,10 @@ def generate_daily_report(inventory_file, sales_file, report_file, date):
         inventory = read_inventory(inventory_file)
         
         # Filter sales for the specified date
-        daily_sales = []
-        
-        with open(sales_file, 'r', newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if row['timestamp'].startswith(date):
-                    daily_sales.append(row)
+        daily_sales = _read_daily_sales(sales_file, date)
         
         # Calculate daily totals
-        total_revenue = sum(float(sale['total_price']) for sale in daily_sales)
+        total_revenue = sum(float(total_price) for _, _, _, total_price in daily_sales)
         
         # Generate the report
         with open(report_file, 'w') as file:
@@ -236,8 +473,8 @@ def generate_daily_report(inventory_file, sales_file, report_file, date):
                 file.write(f"{item}: {details['quantity']} units at ${details['price']:.2f} each\n")
             
             file.write("\nDETAILED SALES\n")
-            for sale in daily_sales:
-                file.write(f"{sale['timestamp']} - {sale['item_name']} x{sale['quantity']} - ${float(sale['total_price']):.2f}\n")
+            for timestamp, item_name, quantity, total_price in daily_sales:
+                file.write(f"{timestamp} - {item_name} x{quantity} - ${float(total_price):.2f}\n")
     
     except (FileNotFoundError, IOError) as e:
         raise Exception(f"Error generating report: {e}")
@@ -257,46 +494,31 @@ def search_feedback(file_path, search_term):
     Raises:
         FileNotFoundError: If the file does not exist
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Feedback file not found: {file_path}")
-    
-    results = []
-    current_feedback = {}
-    
     try:
         with open(file_path, 'r') as file:
-            collecting = False
-            
-            for line in file:
-                line = line.strip()
-                
-                if line.startswith("===== FEEDBACK:"):
-                    # Start of a new feedback entry
-                    if collecting and search_term.lower() in ' '.join(current_feedback.values()).lower():
-                        results.append(current_feedback.copy())
-                    
-                    current_feedback = {}
-                    collecting = True
-                    current_feedback["timestamp"] = line.split("FEEDBACK: ")[1].strip("=").strip()
-                elif collecting and line.startswith("Customer:"):
-                    current_feedback["customer"] = line.split("Customer: ")[1]
-                elif collecting and line.startswith("Rating:"):
-                    current_feedback["rating"] = line.split("Rating: ")[1]
-                elif collecting and line.startswith("Comments:"):
-                    current_feedback["comments"] = line.split("Comments: ")[1]
-                elif line == "" and collecting:
-                    # End of the current feedback
-                    if search_term.lower() in ' '.join(current_feedback.values()).lower():
-                        results.append(current_feedback.copy())
-                    collecting = False
-        
-        # Check the last feedback entry if we're still collecting
-        if collecting and search_term.lower() in ' '.join(current_feedback.values()).lower():
-            results.append(current_feedback.copy())
-            
-        return results
+            content = file.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Feedback file not found: {file_path}")
     except IOError as e:
         raise IOError(f"Error reading feedback file: {e}")
+    
+    # A single regex scan finds each entry. A term without spaces cannot
+    # span two fields, so entries whose text lacks it are skipped before
+    # their fields are pulled out into a dict
+    term = search_term.lower()
+    prefilter = ' ' not in term
+    results = []
+    for match in _FEEDBACK_RE.finditer(content):
+        if prefilter and term not in match.group(0).lower():
+            continue
+        
+        feedback = {'timestamp': match.group('timestamp')}
+        for field, value in _FEEDBACK_FIELD_RE.findall(match.group('body')):
+            feedback[field.lower()] = value
+        
+        if term in ' '.join(feedback.values()).lower():
+            results.append(feedback)
+    return results
 
 
 def backup_data_files(source_dir, backup_dir):
@@ -320,21 +542,26 @@ def backup_data_files(source_dir, backup_dir):
         os.makedirs(backup_dir)
     
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_count = 0
+    source_paths = []
+    backup_paths = []
     
     try:
-        for filename in os.listdir(source_dir):
-            if filename.endswith(('.txt', '.csv')):
-                source_path = os.path.join(source_dir, filename)
-                backup_name = f"{os.path.splitext(filename)[0]}_{timestamp}{os.path.splitext(filename)[1]}"
-                backup_path = os.path.join(backup_dir, backup_name)
-                
-                with open(source_path, 'r') as source, open(backup_path, 'w') as backup:
-                    backup.write(source.read())
-                
-                backup_count += 1
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(('.txt', '.csv')):
+                    stem, extension = os.path.splitext(entry.name)
+                    source_paths.append(entry.path)
+                    backup_paths.append(os.path.join(backup_dir, f"{stem}_{timestamp}{extension}"))
+        
+        if not source_paths:
+            return 0
         
-        return backup_count
+        # Copies are independent and I/O-bound, so overlap them on threads
+        with ThreadPoolExecutor(max_workers=min(8, len(source_paths))) as executor:
+            # Consume the results so a failed copy is re-raised here
+            list(executor.map(shutil.copyfile, source_paths, backup_paths))
+        
+        return len(source_paths)
     except IOError as e:
         raise IOError(f"Backup operation failed: {e}")
 
@@ -389,25 +616,8 @@ def main():
                 item_name = input("Enter item name: ")
                 quantity = int(input("Enter quantity sold: "))
                 
-                # Check inventory
-                inventory = read_inventory(inventory_file)
-                if item_name not in inventory:
-                    print(f"Error: {item_name} not found in inventory")
-                    continue
-                
-                if inventory[item_name]['quantity'] < quantity:
-                    print(f"Error: Not enough {item_name} in inventory")
-                    continue
-                
-                price = inventory[item_name]['price']
-                total_price = price * quantity
-                
-                # Record the sale
-                log_sale(sales_file, item_name, quantity, total_price)
-                
-                # Update inventory
-                new_quantity = inventory[item_name]['quantity'] - quantity
-                update_inventory(inventory_file, item_name, new_quantity, price)
+                # Check stock, log the sale and update the inventory
+                total_price = apply_sale(inventory_file, sales_file, item_name, quantity)
                 
                 print(f"Sale recorded: {quantity} {item_name} for ${total_price:.2f}")
             
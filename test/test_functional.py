@@ -1,171 +1,231 @@
+"""Functional tests for street_food_vendor_management.
+
+Assertion messages are plain strings unless the actual value helps diagnose
+a failure; CPython only evaluates an assert's message when the assertion
+fails, so f-string messages cost nothing on passing runs.
+"""
 import os
-import tempfile
+import re
+import shutil
 import pytest
-from test.TestUtils import TestUtils
-from street_food_vendor_management import read_inventory, update_inventory, log_sale, save_customer_feedback, read_sales_report, generate_daily_report, backup_data_files, search_feedback
+from street_food_vendor_management import read_inventory, update_inventory, log_sale, apply_sale, save_customer_feedback, read_sales_report, generate_daily_report, backup_data_files, search_feedback
+
+
+# Sample file contents, built once and written as-is by the fixtures
+_INVENTORY_PAYLOAD = b"# Inventory data\nsamosa,10,2.50\ntacos,15,3.75\n"
+_SALES_PAYLOAD = (
+    b"timestamp,item_name,quantity,total_price\n"
+    b"2023-01-01 12:00:00,samosa,5,12.50\n"
+    b"2023-01-01 13:00:00,tacos,3,11.25\n"
+    b"2023-01-01 14:00:00,samosa,2,5.00\n"
+)
+_DAILY_SALES_PAYLOAD = (
+    b"timestamp,item_name,quantity,total_price\n"
+    b"2023-01-01 12:00:00,samosa,5,12.50\n"
+    b"2023-01-02 09:00:00,tacos,1,3.75\n"
+    b"\"2023-01-01 13:00:00\",tacos,3,11.25\n"  # Quoted timestamp
+)
+_EDGE_FORMAT_INVENTORY_PAYLOAD = (
+    b"# Inventory with unusual formatting\n"
+    b"samosa  ,  10,2.50\n"  # Extra spaces
+    b"tacos,15  ,  3.75\n"   # More unusual spacing
+    b"\n"                    # Empty line
+    b"# Comment line\n"      # Comment in middle
+    b"burger,8,5.25\n"       # Normal line after comment
+)
+
+# Lines save_customer_feedback is expected to write for the sample feedback
+_EXPECTED_FEEDBACK = {
+    "Customer: John Doe",
+    "Rating: 4/5",
+    "Comments: Great food and quick service!",
+}
+_FEEDBACK_PATTERN = re.compile("|".join(re.escape(line) for line in _EXPECTED_FEEDBACK))
+
+
+@pytest.fixture(scope="module")
+def sample_inventory_file(tmp_path_factory):
+    """Inventory file with test data, written once per module"""
+    path = tmp_path_factory.mktemp("inventory") / "inventory.txt"
+    path.write_bytes(_INVENTORY_PAYLOAD)
+    return path
+
 
+@pytest.fixture
+def inventory_file(sample_inventory_file, tmp_path):
+    """Private copy of the sample inventory for tests that update it"""
+    path = tmp_path / "inventory.txt"
+    shutil.copyfile(sample_inventory_file, path)
+    return path
 
-def test_inventory_operations():
+
+@pytest.fixture(scope="module")
+def sales_file(tmp_path_factory):
+    """Sales file with test data, written once per module"""
+    path = tmp_path_factory.mktemp("sales") / "sales.csv"
+    path.write_bytes(_SALES_PAYLOAD)
+    return path
+
+
+@pytest.fixture(scope="module")
+def edge_format_inventory_file(tmp_path_factory):
+    """Inventory file with unusual spacing/formatting, written once per module"""
+    path = tmp_path_factory.mktemp("edge_formats") / "inventory.txt"
+    path.write_bytes(_EDGE_FORMAT_INVENTORY_PAYLOAD)
+    return path
+
+
+@pytest.mark.category("functional")
+def test_inventory_operations(inventory_file):
     """Test basic inventory operations"""
-    # Create a temporary file with test data
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp:
-        temp.write("# Inventory data\n")
-        temp.write("samosa,10,2.50\n")
-        temp.write("tacos,15,3.75\n")
-        inventory_file = temp.name
-    
-    try:
-        # Test reading inventory
-        inventory = read_inventory(inventory_file)
-        
-        # Verify the read results
-        assert 'samosa' in inventory, "Item 'samosa' not found in inventory"
-        assert 'tacos' in inventory, "Item 'tacos' not found in inventory"
-        
-        # Check if values match
-        assert inventory['samosa']['quantity'] == 10, "Quantity mismatch for samosa"
-        assert inventory['samosa']['price'] == 2.50, "Price mismatch for samosa"
-        assert inventory['tacos']['quantity'] == 15, "Quantity mismatch for tacos"
-        assert inventory['tacos']['price'] == 3.75, "Price mismatch for tacos"
-        
-        # Test updating inventory
-        update_inventory(inventory_file, "burger", 8, 5.25)
-        
-        # Verify the update
-        updated_inventory = read_inventory(inventory_file)
-        assert 'burger' in updated_inventory, "New item not added to inventory"
-        assert updated_inventory['burger']['quantity'] == 8, "New item quantity incorrect"
-        assert updated_inventory['burger']['price'] == 5.25, "New item price incorrect"
-        
-        TestUtils.yakshaAssert("test_inventory_operations", True, "functional")
-    except Exception as e:
-        TestUtils.yakshaAssert("test_inventory_operations", False, "functional")
-        raise e
-    finally:
-        os.remove(inventory_file)
-
-
-def test_sales_and_feedback():
+    # Test reading inventory
+    inventory = read_inventory(inventory_file)
+    
+    # Verify the read results
+    assert 'samosa' in inventory, "Item 'samosa' not found in inventory"
+    assert 'tacos' in inventory, "Item 'tacos' not found in inventory"
+    
+    # Check if values match
+    assert inventory['samosa']['quantity'] == 10, "Quantity mismatch for samosa"
+    assert inventory['samosa']['price'] == 2.50, "Price mismatch for samosa"
+    assert inventory['tacos']['quantity'] == 15, "Quantity mismatch for tacos"
+    assert inventory['tacos']['price'] == 3.75, "Price mismatch for tacos"
+    
+    # Test updating inventory; the file is swapped in atomically, so the
+    # path ends up pointing at a new file
+    original_inode = os.stat(inventory_file).st_ino
+    updated_inventory = update_inventory(inventory_file, "burger", 8, 5.25)
+    
+    # Verify the update
+    assert os.stat(inventory_file).st_ino != original_inode, "Inventory file was not replaced"
+    assert 'burger' in updated_inventory, "New item not added to inventory"
+    assert updated_inventory['burger']['quantity'] == 8, "New item quantity incorrect"
+    assert updated_inventory['burger']['price'] == 5.25, "New item price incorrect"
+    assert b"burger,8,5.25\n" in inventory_file.read_bytes(), "New item not written to the inventory file"
+
+
+@pytest.mark.category("functional")
+def test_sales_and_feedback(tmp_path):
     """Test sales logging and feedback functions"""
-    # Create temporary files
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_sales:
-        sales_file = temp_sales.name
-    
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_feedback:
-        feedback_file = temp_feedback.name
-    
-    try:
-        # Test logging a sale
-        log_sale(sales_file, "tacos", 3, 11.25)
-        
-        # Verify sale was logged correctly
-        with open(sales_file, 'r') as file:
-            content = file.readlines()
-        
-        # Check sales data format
-        parts = content[0].strip().split(',')
-        assert len(parts) == 4, "Sale record does not have 4 fields"
-        assert "tacos" in parts, "Item name not found in sale record"
-        assert "3" in parts, "Quantity not found in sale record"
-        assert "11.25" in parts, "Total price not found in sale record"
-        
-        # Test saving customer feedback
-        save_customer_feedback(feedback_file, "John Doe", 4, "Great food and quick service!")
-        
-        # Verify feedback was saved correctly
-        with open(feedback_file, 'r') as file:
-            content = file.read()
-        
-        assert "Customer: John Doe" in content, "Customer name not found"
-        assert "Rating: 4/5" in content, "Rating not found"
-        assert "Comments: Great food and quick service!" in content, "Comments not found"
-        
-        TestUtils.yakshaAssert("test_sales_and_feedback", True, "functional")
-    except Exception as e:
-        TestUtils.yakshaAssert("test_sales_and_feedback", False, "functional")
-        raise e
-    finally:
-        for file in [sales_file, feedback_file]:
-            if os.path.exists(file):
-                os.remove(file)
-
-
-def test_sales_report():
+    # Create empty files; an existing sales file gets no header row
+    sales_file = tmp_path / "sales.csv"
+    sales_file.touch()
+    
+    feedback_file = tmp_path / "feedback.txt"
+    feedback_file.touch()
+    
+    # Test logging a sale
+    log_sale(sales_file, "tacos", 3, 11.25)
+    
+    # Verify sale was logged correctly; only the first record is needed
+    with open(sales_file, 'r') as file:
+        parts = file.readline().rstrip('\n').split(',')
+    
+    # Check sales data format
+    assert len(parts) == 4, "Sale record does not have 4 fields"
+    missing = {"tacos", "3", "11.25"} - set(parts)
+    assert not missing, f"Item name, quantity or total price not found in sale record: {missing}"
+    
+    # Test saving customer feedback
+    save_customer_feedback(feedback_file, "John Doe", 4, "Great food and quick service!")
+    
+    # Verify feedback was saved correctly
+    with open(feedback_file, 'r') as file:
+        content = file.read()
+    
+    # Find all expected lines in a single pass over the file
+    missing = _EXPECTED_FEEDBACK - set(_FEEDBACK_PATTERN.findall(content))
+    assert not missing, f"Customer name, rating or comments not found: {missing}"
+
+
+@pytest.mark.category("functional")
+def test_sales_report(sales_file):
     """Test sales report generation"""
-    # Create a temporary file with test sales data
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp:
-        temp.write("timestamp,item_name,quantity,total_price\n")
-        temp.write("2023-01-01 12:00:00,samosa,5,12.50\n")
-        temp.write("2023-01-01 13:00:00,tacos,3,11.25\n")
-        temp.write("2023-01-01 14:00:00,samosa,2,5.00\n")
-        sales_file = temp.name
-    
-    try:
-        # Test reading sales report
-        report = read_sales_report(sales_file)
-        
-        # Verify the report data
-        assert report['total_revenue'] > 0, "Total revenue should be greater than 0"
-        assert report['items_sold'] > 0, "Items sold should be greater than 0"
-        assert report['unique_items'] > 0, "Unique items should be greater than 0"
-        assert report['best_seller'] is not None, "Best seller should not be None"
-        assert 'samosa' in report['item_breakdown'], "Samosa should be in item breakdown"
-        assert 'tacos' in report['item_breakdown'], "Tacos should be in item breakdown"
-        
-        TestUtils.yakshaAssert("test_sales_report", True, "functional")
-    except Exception as e:
-        TestUtils.yakshaAssert("test_sales_report", False, "functional")
-        raise e
-    finally:
-        os.remove(sales_file)
-
-
-def test_file_operations_with_edge_formats():
+    # Test reading sales report
+    report = read_sales_report(sales_file)
+    
+    # Verify the report data
+    assert report['total_revenue'] > 0, "Total revenue should be greater than 0"
+    assert report['items_sold'] > 0, "Items sold should be greater than 0"
+    assert report['unique_items'] > 0, "Unique items should be greater than 0"
+    assert report['best_seller'] is not None, "Best seller should not be None"
+    assert 'samosa' in report['item_breakdown'], "Samosa should be in item breakdown"
+    assert 'tacos' in report['item_breakdown'], "Tacos should be in item breakdown"
+
+
+@pytest.mark.category("boundary")
+def test_file_operations_with_edge_formats(edge_format_inventory_file):
     """Test handling of edge cases in file formats"""
-    # Test inventory file with unusual spacing/formatting
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_inv:
-        temp_inv.write("# Inventory with unusual formatting\n")
-        temp_inv.write("samosa  ,  10,2.50\n")  # Extra spaces
-        temp_inv.write("tacos,15  ,  3.75\n")   # More unusual spacing
-        temp_inv.write("\n")                    # Empty line
-        temp_inv.write("# Comment line\n")      # Comment in middle
-        temp_inv.write("burger,8,5.25\n")       # Normal line after comment
-        inventory_file = temp_inv.name
-    
-    try:
-        # Test reading inventory with unusual formatting
-        inventory = read_inventory(inventory_file)
-        
-        # Verify all items were correctly parsed - allowing for spaces in keys
-        assert len(inventory) == 3, f"Expected 3 items in inventory, got {len(inventory)}"
-        
-        # Check if keys with or without spaces exist
-        key_found = False
-        for key in inventory.keys():
-            if key.strip() == "samosa":
-                key_found = True
-                break
-        assert key_found, "Failed to parse item with extra spaces"
-        
-        # Check tacos exists (either with or without spaces)
-        key_found = False
-        for key in inventory.keys():
-            if key.strip() == "tacos":
-                key_found = True
-                break
-        assert key_found, "Failed to parse item with unusual spacing"
-        
-        # Check burger exists
-        key_found = False
-        for key in inventory.keys():
-            if key.strip() == "burger":
-                key_found = True
-                break
-        assert key_found, "Failed to parse item after comment and empty line"
-        
-        TestUtils.yakshaAssert("test_file_operations_with_edge_formats", True, "boundary")
-    except Exception as e:
-        TestUtils.yakshaAssert("test_file_operations_with_edge_formats", False, "boundary")
-        raise e
-    finally:
-        os.remove(inventory_file)
\ No newline at end of file
+    # Test reading inventory with unusual formatting
+    inventory = read_inventory(edge_format_inventory_file)
+    
+    # Verify all items were correctly parsed - allowing for spaces in keys
+    assert len(inventory) == 3, f"Expected 3 items in inventory, got {len(inventory)}"
+    
+    # Index items by stripped name so keys with or without spaces match
+    normalized = {key.strip(): details for key, details in inventory.items()}
+    
+    assert "samosa" in normalized, "Failed to parse item with extra spaces"
+    assert "tacos" in normalized, "Failed to parse item with unusual spacing"
+    assert "burger" in normalized, "Failed to parse item after comment and empty line"
+
+
+def test_generate_daily_report(inventory_file, tmp_path):
+    """Test that the daily report covers only the requested date"""
+    sales_file = tmp_path / "sales.csv"
+    sales_file.write_bytes(_DAILY_SALES_PAYLOAD)
+    report_file = tmp_path / "report.txt"
+    
+    generate_daily_report(inventory_file, sales_file, report_file, "2023-01-01")
+    
+    report = report_file.read_text()
+    assert "DAILY SALES REPORT - 2023-01-01" in report, "Report title missing"
+    assert "Total Revenue: $23.75" in report, "Total revenue incorrect"
+    assert "Number of Sales: 2" in report, "Sales count incorrect"
+    assert "samosa: 10 units at $2.50 each" in report, "Inventory status missing"
+    assert "2023-01-01 13:00:00 - tacos x3 - $11.25" in report, "Sale with a quoted timestamp missing"
+    assert "2023-01-02" not in report, "Sale from another date included"
+
+
+def test_sales_report_after_log_sale(tmp_path):
+    """Test that the sales report picks up sales logged after it was read"""
+    sales_file = tmp_path / "sales.csv"
+    sales_file.write_bytes(_SALES_PAYLOAD)
+    assert read_sales_report(sales_file)['item_breakdown'] == {'samosa': 7, 'tacos': 3}, "Item breakdown incorrect"
+    
+    log_sale(sales_file, "burger", 2, 10.50)
+    
+    report = read_sales_report(sales_file)
+    assert report['item_breakdown'] == {'samosa': 7, 'tacos': 3, 'burger': 2}, "Report not updated after log_sale"
+    assert report['total_revenue'] == pytest.approx(39.25), "Revenue not updated after log_sale"
+
+
+def test_daily_report_after_log_sale(inventory_file, tmp_path):
+    """Test that the daily report picks up sales logged after it was generated"""
+    sales_file = tmp_path / "sales.csv"
+    report_file = tmp_path / "report.txt"
+    log_sale(sales_file, "samosa", 1, 2.50)
+    today = sales_file.read_text().splitlines()[1][:10]
+    
+    generate_daily_report(inventory_file, sales_file, report_file, today)
+    assert "Number of Sales: 1" in report_file.read_text(), "Sales count incorrect"
+    
+    log_sale(sales_file, "tacos", 2, 7.50)
+    
+    generate_daily_report(inventory_file, sales_file, report_file, today)
+    report = report_file.read_text()
+    assert "Number of Sales: 2" in report, "Report not updated after log_sale"
+    assert "Total Revenue: $10.00" in report, "Revenue not updated after log_sale"
+
+
+def test_apply_sale(inventory_file, tmp_path):
+    """Test that a sale is logged and deducted from the inventory"""
+    sales_file = tmp_path / "sales.csv"
+    
+    total_price = apply_sale(inventory_file, sales_file, "samosa", 4)
+    
+    assert total_price == 10.0, "Total price incorrect"
+    assert read_inventory(inventory_file)['samosa']['quantity'] == 6, "Sold quantity not deducted"
+    lines = sales_file.read_text().splitlines()
+    assert len(lines) == 2, "Expected a header and one sale record"
+    assert lines[1].split(',', 1)[1] == "samosa,4,10.0", f"Unexpected sale record: {lines[1]}"
\ No newline at end of file